@@ -1,24 +1,49 @@
 import os
-import json
-from flask import Flask, jsonify, request
+import logging
+import gzip
+import hashlib
+import orjson
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from flask import Flask, Response, request
 from flask_cors import CORS # Import Flask-Cors for handling CORS
+from google.api_core.exceptions import NotFound, NotModified
 from google.cloud import storage
-from datetime import datetime, timedelta
+from cachetools import TTLCache
+from threading import RLock
+
+# --- Logging ---
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app) # Enable CORS for all routes
 
 # --- Configuration ---
 GCS_BUCKET_NAME = os.environ.get("GCS_BUCKET_NAME")
+GCS_DOWNLOAD_WORKERS = 16 # Max concurrent GCS downloads per request
+GZIP_MAGIC = b"\x1f\x8b" # Leading bytes of gzip-compressed blobs written by the ingestor
+FRED_BUNDLE_FILENAME = "economic_data/fred/bundle.json" # All FRED series in one object, written by the ingestor
 
 # --- GCS Client ---
 storage_client = storage.Client()
 
 # --- In-memory cache for economic data ---
-# This cache will store data to serve quickly without re-reading from GCS every time.
-# Data will expire after CACHE_TTL_SECONDS to ensure freshness.
-data_cache = {}
+# This cache stores each indicator's column-wise series once (keyed by indicator key),
+# so the "all" and per-indicator queries share the same entries. Serialized responses
+# are cached alongside them, keyed by ("response", layout, indicator keys); a response is
+# only served while the indicator entries it was built from are still the cached ones.
+# Data will expire after CACHE_TTL_SECONDS to ensure freshness (TTLCache uses a monotonic clock),
+# and the cache is bounded to CACHE_MAX_ENTRIES. TTLCache isn't thread-safe, so access goes through cache_lock.
 CACHE_TTL_SECONDS = 3600 # Cache data for 1 hour (3600 seconds)
+CACHE_MAX_ENTRIES = 64
+data_cache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+cache_lock = RLock()
+
+# --- Parsed GCS blobs keyed by filename ---
+# Each entry keeps the blob's ETag so unchanged blobs are never downloaded or parsed twice.
+blob_cache = {}
 
 # --- Define the FRED Series IDs and their human-readable names ---
 # These should match the files uploaded by your ingestor_main.py
@@ -38,42 +63,155 @@ FRED_SERIES_MAP = {
     "us_continuing_jobless_claims": {"series_id": "CCSA", "name": "Continuing Jobless Claims", "unit": "Thousands", "frequency": "Weekly"}
 }
 
+# Per-indicator metadata, built once and shared by every response
+US_INDICATOR_METADATA = {
+    key: {
+        "name": info['name'],
+        "unit": info['unit'],
+        "frequency": info['frequency'],
+        "country": "US",
+        "currency": "USD" # Assuming USD for US data
+    }
+    for key, info in FRED_SERIES_MAP.items()
+}
+
 # --- Helper Functions ---
 
 def load_data_from_gcs(filename):
-    """Loads a JSON object from Google Cloud Storage."""
+    """Loads a JSON object from Google Cloud Storage, reusing the parsed copy if the blob is unchanged."""
     if not GCS_BUCKET_NAME:
-        print("ERROR: GCS_BUCKET_NAME not set. Cannot load data from GCS.")
+        logger.error("GCS_BUCKET_NAME not set. Cannot load data from GCS.")
         return None
     
     bucket = storage_client.bucket(GCS_BUCKET_NAME)
     blob = bucket.blob(filename)
+    cached_blob = blob_cache.get(filename)
     
     try:
-        if not blob.exists():
-            print(f"WARNING: File {filename} not found in GCS bucket {GCS_BUCKET_NAME}.")
-            return None
-        
-        data = blob.download_as_text()
-        return json.loads(data)
+        # Conditional GET: GCS answers 304 (NotModified) if the ETag still matches.
+        # raw_download keeps gzip-encoded blobs compressed on the wire; we inflate them here.
+        data = blob.download_as_bytes(
+            raw_download=True,
+            if_etag_not_match=cached_blob['etag'] if cached_blob else None
+        )
+        if data[:2] == GZIP_MAGIC:
+            data = gzip.decompress(data)
+        parsed = orjson.loads(data)
+        blob_cache[filename] = {'etag': blob.etag, 'data': parsed}
+        return parsed
+    except NotModified:
+        return cached_blob['data']
+    except NotFound:
+        logger.warning("File %s not found in GCS bucket %s.", filename, GCS_BUCKET_NAME)
+        blob_cache.pop(filename, None)
+        return None
     except Exception as e:
-        print(f"ERROR loading {filename} from GCS: {e}")
+        logger.error("Failed loading %s from GCS: %s", filename, e)
         return None
 
 def get_cached_data(key):
     """Retrieves data from cache if not expired."""
-    if key in data_cache:
-        cached_item = data_cache[key]
-        if datetime.now() < cached_item['expiry']:
-            return cached_item['data']
-    return None
+    with cache_lock:
+        return data_cache.get(key)
 
 def set_cached_data(key, data):
-    """Stores data in cache with an expiry time."""
-    data_cache[key] = {
-        'data': data,
-        'expiry': datetime.now() + timedelta(seconds=CACHE_TTL_SECONDS)
-    }
+    """Stores data in cache; it expires after CACHE_TTL_SECONDS."""
+    with cache_lock:
+        data_cache[key] = data
+
+def cache_indicator(key, data):
+    """Caches a single indicator's column-wise series, as loaded from GCS, and returns it."""
+    if not data:
+        # Cache the miss too, so a missing series isn't re-requested from GCS on every call
+        logger.warning("Could not load data for %s from GCS.", key)
+        # Return the very object that was cached, so cached responses built from it stay valid
+        empty = {}
+        set_cached_data(key, empty)
+        return empty
+
+    if isinstance(data, list):
+        # Blob written before the ingestor switched to column-wise storage
+        data = {
+            "series_id": data[0]['series_id'],
+            "source": data[0]['source'],
+            "dates": [item['date'] for item in data],
+            "values": [item['value'] for item in data]
+        }
+
+    set_cached_data(key, data)
+    logger.info("Successfully loaded and cached US data for %s", key)
+    return data
+
+def load_indicator(key):
+    """Loads a single indicator from its own GCS file and caches the result."""
+    return cache_indicator(key, load_data_from_gcs(f"economic_data/fred/{key.lower()}.json"))
+
+def load_us_indicators(requested_indicator, requested_keys):
+    """Returns {key: column-wise series} for the requested indicators, from cache or GCS."""
+    # Serve what we can from the per-indicator cache
+    per_indicator = {key: get_cached_data(key) for key in requested_keys}
+    missing_keys = [key for key, data in per_indicator.items() if data is None]
+
+    # Without a filter, fill the misses from the bundle in a single GCS read
+    if missing_keys and not requested_indicator:
+        bundle = load_data_from_gcs(FRED_BUNDLE_FILENAME)
+        if bundle:
+            for key in missing_keys:
+                if key in bundle:
+                    per_indicator[key] = cache_indicator(key, bundle[key])
+            missing_keys = [key for key in missing_keys if key not in bundle]
+
+    # Anything left is read from its own file; each is a blocking GCS round-trip, so issue them concurrently
+    if missing_keys:
+        with ThreadPoolExecutor(max_workers=min(GCS_DOWNLOAD_WORKERS, len(missing_keys))) as executor:
+            per_indicator.update(zip(missing_keys, executor.map(load_indicator, missing_keys)))
+
+    return per_indicator
+
+def build_us_response(per_indicator, layout):
+    """Assembles the US economic data response body for the given indicators and layout."""
+    if layout == 'series':
+        series = [
+            {"key": key, **US_INDICATOR_METADATA[key], "dates": data['dates'], "values": data['values']}
+            for key, data in per_indicator.items()
+            if data
+        ]
+        return {"status": "success", "series": series}
+
+    # Flat layout: one record per observation, with metadata added for easier frontend processing
+    per_series_records = []
+    for key, data in per_indicator.items():
+        if not data:
+            continue
+        meta = US_INDICATOR_METADATA[key]
+        record_meta = {
+            'series_id': data['series_id'],
+            'source': data['source'],
+            'indicator_name': meta['name'],
+            'unit': meta['unit'],
+            'frequency': meta['frequency'],
+            'country': meta['country'],
+            'currency': meta['currency']
+        }
+        per_series_records.append([
+            {'date': date, 'value': value, **record_meta}
+            for date, value in zip(data['dates'], data['values'])
+        ])
+
+    # Order by date (most recent first). Each series is stored newest-first by the ingestor,
+    # so a k-way merge of the per-series lists replaces a full sort.
+    all_us_data = list(heapq.merge(*per_series_records, key=itemgetter('date'), reverse=True))
+
+    return {"status": "success", "data": all_us_data}
+
+def make_json_response(cached_response):
+    """Builds a JSON response from pre-serialized bytes, with ETag and Cache-Control headers."""
+    response = Response(cached_response['payload'], mimetype="application/json")
+    response.set_etag(cached_response['etag'])
+    response.cache_control.public = True
+    response.cache_control.max_age = CACHE_TTL_SECONDS
+    # Answers 304 Not Modified when the client's If-None-Match matches
+    return response.make_conditional(request)
 
 # --- API Endpoints ---
 
@@ -82,46 +220,32 @@ def get_us_economic_data():
     """
     Endpoint to retrieve US economic data.
     Can be filtered by indicator (e.g., ?indicator=US_CPI_ALL_ITEMS).
+    Pass ?layout=series to get one entry per indicator, with its metadata
+    stated once next to its dates/values arrays, instead of a flat list of records.
     """
     requested_indicator = request.args.get('indicator')
-    
-    # Try to serve from cache first
-    cache_key = f"us_data_{requested_indicator or 'all'}"
-    cached_response = get_cached_data(cache_key)
-    if cached_response:
-        print(f"Serving US data from cache for {cache_key}")
-        return jsonify(cached_response)
+    layout = 'series' if request.args.get('layout') == 'series' else 'flat'
 
-    all_us_data = []
-    
-    for key, info in FRED_SERIES_MAP.items():
-        # If a specific indicator is requested, only fetch that one
-        if requested_indicator and requested_indicator != key:
-            continue
+    # If a specific indicator is requested, only fetch that one
+    requested_keys = [key for key in FRED_SERIES_MAP if not requested_indicator or requested_indicator == key]
+
+    # Serve the already-serialized response from cache when possible. It is rebuilt as soon as any
+    # indicator entry it was made from has expired or been replaced, so it never outlives their TTL.
+    cache_key = ("response", layout, tuple(requested_keys))
+    cached_response = get_cached_data(cache_key)
+    if cached_response is None or any(
+        get_cached_data(key) is not data for key, data in cached_response['indicators'].items()
+    ):
+        per_indicator = load_us_indicators(requested_indicator, requested_keys)
+        payload = orjson.dumps(build_us_response(per_indicator, layout))
+        cached_response = {
+            'payload': payload,
+            'etag': hashlib.blake2b(payload, digest_size=8).hexdigest(),
+            'indicators': per_indicator
+        }
+        set_cached_data(cache_key, cached_response)
 
-        filename = f"economic_data/fred/{key.lower()}.json"
-        data = load_data_from_gcs(filename)
-        
-        if data:
-            # Add metadata to each data point for easier frontend processing
-            for item in data:
-                item['indicator_name'] = info['name']
-                item['unit'] = info['unit']
-                item['frequency'] = info['frequency']
-                item['country'] = "US"
-                item['currency'] = "USD" # Assuming USD for US data
-            all_us_data.extend(data)
-        else:
-            print(f"Could not load data for {key} from GCS.")
-
-    # Sort data by date (most recent first)
-    all_us_data.sort(key=lambda x: x['date'], reverse=True)
-
-    # Cache the response before returning
-    response_data = {"status": "success", "data": all_us_data}
-    set_cached_data(cache_key, response_data)
-    print(f"Successfully loaded and cached US data for {cache_key}")
-    return jsonify(response_data)
+    return make_json_response(cached_response)
 
 @app.route('/')
 def health_check():
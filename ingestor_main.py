@@ -1,19 +1,88 @@
 import os
+import csv
+import logging
+import gzip
+import hashlib
 import requests
-import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
-from datetime import datetime
+from threading import BoundedSemaphore
+
+# --- JSON Provider ---
+# Routes every jsonify() call through orjson instead of the stdlib json module.
+class OrjsonProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        # Keep jsonify() output deterministic, like the stdlib provider (sort_keys is on by default)
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+# --- Logging ---
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
 
 # --- Flask App Setup ---
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # --- Configuration ---
 FRED_API_KEY = os.environ.get("FRED_API_KEY") # Your FRED API key
 GCS_BUCKET_NAME = os.environ.get("GCS_BUCKET_NAME") # Your GCS bucket name
+INGEST_MAX_WORKERS = int(os.environ.get("INGEST_MAX_WORKERS", 8)) # Series fetched and uploaded concurrently per ingestion run
+GZIP_COMPRESS_LEVEL = 6 # Compression level for JSON blobs stored in GCS
+FRED_OBSERVATION_LIMIT = 500 # Most recent observations kept per FRED series
+FRED_REVISION_WINDOW = 12 # Stored FRED observations re-fetched on each update, so recent revisions are picked up
+GZIP_MAGIC = b"\x1f\x8b" # Leading bytes of a gzip stream
+FRED_BUNDLE_FILENAME = "economic_data/fred/bundle.json" # All FRED series in one object, read by the API
+FRED_SERIES_META_FILENAME = "_meta/fred_series_meta.json" # Per FRED series: last_updated and Last-Modified seen on the previous run
 
 storage_client = storage.Client()
 
+# --- Ingestion Worker Pool ---
+# Created once and reused by every ingestion run. storage_client and http_session are
+# shared by its threads; outbound API calls are paced by the per-API semaphores, so the
+# pool size only bounds how many series are in flight (fetch, serialize, upload) at once.
+ingest_executor = ThreadPoolExecutor(max_workers=INGEST_MAX_WORKERS, thread_name_prefix="ingest")
+
+# --- HTTP Session ---
+# Shared across FRED/ECB calls (and ingestion threads) so connections are reused
+HTTP_TIMEOUT = (5, 30) # (connect, read) timeout in seconds for FRED/ECB requests
+
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    # Transient FRED/ECB errors are retried here rather than costing the series a whole ingestion run.
+    # Waits between attempts are 0s, 1s, 2s, 4s, well under urllib3's backoff cap.
+    max_retries=Retry(
+        total=4,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        respect_retry_after_header=True
+    )
+))
+
+# --- Per-API Concurrency Limits ---
+# Ingestion threads share these so parallel runs stay under FRED/ECB rate limits
+FRED_MAX_CONCURRENT_REQUESTS = 4
+ECB_MAX_CONCURRENT_REQUESTS = 2
+fred_semaphore = BoundedSemaphore(FRED_MAX_CONCURRENT_REQUESTS)
+ecb_semaphore = BoundedSemaphore(ECB_MAX_CONCURRENT_REQUESTS)
+
+# Returned by fetch_fred_data in place of the data when FRED answers a conditional GET with 304
+NOT_MODIFIED = object()
+
 # --- Economic Indicator Definitions ---
 FRED_SERIES = {
     "US_UNEMPLOYMENT_RATE": "UNRATE",                 # Unemployment Rate
@@ -45,27 +114,88 @@ ECB_SERIES = {
 # --- Helper Functions (No Changes Here) ---
 
 def upload_to_gcs(data, filename):
-    """Uploads a JSON object to Google Cloud Storage."""
+    """
+    Uploads a JSON object to Google Cloud Storage, gzip-compressed.
+    Already-serialized JSON (bytes) is uploaded as-is instead of being dumped again.
+    """
     if not GCS_BUCKET_NAME:
-        print("ERROR: GCS_BUCKET_NAME environment variable not set. Cannot upload data.")
+        logger.error("GCS_BUCKET_NAME environment variable not set. Cannot upload data.")
         return False
     
     try:
         bucket = storage_client.bucket(GCS_BUCKET_NAME)
         blob = bucket.blob(filename)
         
-        blob.upload_from_string(json.dumps(data), content_type="application/json")
-        print(f"Successfully uploaded {filename} to GCS bucket {GCS_BUCKET_NAME}")
+        # Stored with Content-Encoding: gzip so GCS can still serve it decompressed to plain clients
+        blob.content_encoding = "gzip"
+        body = data if isinstance(data, (bytes, bytearray)) else orjson.dumps(data)
+        payload = gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL)
+        blob.upload_from_string(payload, content_type="application/json")
+        logger.info("Successfully uploaded %s to GCS bucket %s", filename, GCS_BUCKET_NAME)
         return True
     except Exception as e:
-        print(f"ERROR uploading {filename} to GCS: {e}")
+        logger.error("Failed uploading %s to GCS: %s", filename, e)
         return False
 
-def fetch_fred_data(series_id):
-    """Fetches data for a given FRED series ID."""
+def download_from_gcs(filename):
+    """
+    Downloads a JSON blob from Google Cloud Storage.
+    Returns the decompressed JSON bytes, or None if the blob is missing or cannot be read.
+    """
+    if not GCS_BUCKET_NAME:
+        logger.error("GCS_BUCKET_NAME environment variable not set. Cannot download data.")
+        return None
+
+    try:
+        bucket = storage_client.bucket(GCS_BUCKET_NAME)
+        blob = bucket.blob(filename)
+        data = blob.download_as_bytes(raw_download=True)
+        return gzip.decompress(data) if data[:2] == GZIP_MAGIC else data
+    except NotFound:
+        logger.info("%s not found in GCS bucket %s.", filename, GCS_BUCKET_NAME)
+        return None
+    except Exception as e:
+        logger.error("Failed downloading %s from GCS: %s", filename, e)
+        return None
+
+def fred_last_updated(series_id):
+    """
+    Fetches the last_updated timestamp of a FRED series from its (small) metadata endpoint.
+    Returns the timestamp string, or None on failure.
+    """
+    if not FRED_API_KEY:
+        return None
+
+    base_url = "https://api.stlouisfed.org/fred/series"
+    params = {
+        "series_id": series_id,
+        "api_key": FRED_API_KEY,
+        "file_type": "json"
+    }
+
+    try:
+        with fred_semaphore:
+            response = http_session.get(base_url, params=params, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return orjson.loads(response.content)['seriess'][0]['last_updated']
+    except requests.exceptions.RequestException as e:
+        logger.warning("Failed fetching FRED metadata for %s: %s", series_id, e)
+        return None
+    except (orjson.JSONDecodeError, KeyError, IndexError) as e:
+        logger.warning("Failed reading FRED metadata for %s: %s", series_id, e)
+        return None
+
+def fetch_fred_data(series_id, last_modified=None, observation_start=None):
+    """
+    Fetches data for a given FRED series ID.
+    If last_modified is given it is sent as If-Modified-Since; observation_start (YYYY-MM-DD) limits
+    the fetch to observations from that date on.
+    Returns (data, Last-Modified header): data is the series column-wise ({"series_id", "source", "dates", "values"}),
+    NOT_MODIFIED if FRED reports no change since last_modified, or None on failure.
+    """
     if not FRED_API_KEY:
-        print(f"WARNING: FRED_API_KEY environment variable not set for series {series_id}. Skipping FRED fetch.")
-        return []
+        logger.warning("FRED_API_KEY environment variable not set for series %s. Skipping FRED fetch.", series_id)
+        return None, None
 
     base_url = "https://api.stlouisfed.org/fred/series/observations"
     params = {
@@ -73,104 +203,187 @@ def fetch_fred_data(series_id):
         "api_key": FRED_API_KEY,
         "file_type": "json",
         "sort_order": "desc",
-        "limit": 500
+        "limit": FRED_OBSERVATION_LIMIT
     }
+    if observation_start:
+        params["observation_start"] = observation_start
+    headers = {"If-Modified-Since": last_modified} if last_modified else None
 
     try:
-        print(f"Fetching FRED data for series: {series_id}")
-        response = requests.get(base_url, params=params)
+        logger.info("Fetching FRED data for series: %s", series_id)
+        with fred_semaphore:
+            response = http_session.get(base_url, params=params, headers=headers, timeout=HTTP_TIMEOUT)
+        if response.status_code == 304:
+            logger.info("FRED series %s not modified since %s.", series_id, last_modified)
+            return NOT_MODIFIED, last_modified
         response.raise_for_status()
-        data = response.json().get('observations', [])
-        
-        processed_data = []
-        for obs in data:
-            if obs['value'] != '.':
-                processed_data.append({
-                    "date": obs['date'],
-                    "value": float(obs['value']),
-                    "series_id": series_id,
-                    "source": "FRED"
-                })
-        print(f"Successfully fetched {len(processed_data)} observations for {series_id}.")
-        return processed_data
+        observations = orjson.loads(response.content).get('observations', ())
+
+        # Store the series column-wise; FRED marks missing observations with '.'.
+        # Observations arrive newest-first (sort_order=desc) and are kept in that order,
+        # which the API relies on to merge series without re-sorting.
+        dates = []
+        raw_values = []
+        for obs in observations:
+            value = obs['value']
+            if value != '.':
+                dates.append(obs['date'])
+                raw_values.append(value)
+
+        # Convert the whole column at once; map() drives float() from C rather than per-row bytecode
+        values = list(map(float, raw_values))
+
+        logger.info("Successfully fetched %d observations for %s.", len(dates), series_id)
+        data = {"series_id": series_id, "source": "FRED", "dates": dates, "values": values}
+        return data, response.headers.get("Last-Modified")
     except requests.exceptions.RequestException as e:
-        print(f"ERROR fetching FRED data for {series_id}: {e}")
-        return []
-    except json.JSONDecodeError as e:
-        print(f"ERROR decoding FRED JSON for {series_id}: {e}")
-        print(f"FRED Response content: {response.text}")
-        return []
+        logger.error("Failed fetching FRED data for %s: %s", series_id, e)
+        return None, None
+    except orjson.JSONDecodeError as e:
+        logger.error("Failed decoding FRED JSON for %s: %s", series_id, e)
+        # Decoding the body is only worth it when someone is going to read it
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("FRED Response content: %s", response.text)
+        return None, None
 
 def fetch_ecb_data(flow_ref, key_values):
-    """Fetches data from ECB SDW API for a given flow and key values."""
+    """
+    Fetches data from ECB SDW API for a given flow and key values.
+    Returns the series column-wise ({"flow_ref", "key_values", "source", "dates", "values"}), or None on failure.
+    """
     base_url = f"https://sdw-wsrest.ecb.europa.eu/service/data/{flow_ref}/{key_values}"
-    headers = {"Accept": "application/json"}
+    # CSV gives one flat row per observation (TIME_PERIOD, OBS_VALUE, ...), so there is no
+    # SDMX-JSON index structure to walk and rows can be parsed as they stream in
+    headers = {"Accept": "text/csv"}
 
     try:
-        print(f"Fetching ECB data from URL: {base_url}")
-        response = requests.get(base_url, headers=headers)
-        response.raise_for_status()
+        logger.info("Fetching ECB data from URL: %s", base_url)
+        # The body is streamed, so it is read and parsed while still holding the ECB slot
+        with ecb_semaphore:
+            response = http_session.get(base_url, headers=headers, timeout=HTTP_TIMEOUT, stream=True)
+
+            # Closing the streamed response hands its connection back to the session pool
+            with response:
+                response.raise_for_status()
+                logger.info("ECB API raw response status: %s", response.status_code)
 
-        data = response.json()
-        print(f"ECB API raw response status: {response.status_code}")
-        # print(f"ECB API raw response content (first 500 chars): {response.text[:500]}") # Uncomment for verbose
-
-        processed_data = []
-        try:
-            data_sets = data.get('dataSets', [])
-            if not data_sets:
-                print(f"ECB PARSING ERROR: No 'dataSets' found for {flow_ref}/{key_values}. Raw response might be empty or malformed.")
-                return []
-            
-            series_data = data_sets[0].get('series', {})
-            if not series_data:
-                print(f"ECB PARSING ERROR: No 'series' data in first dataSet for {flow_ref}/{key_values}. Raw response might be empty or malformed.")
-                return []
-
-            for series_key, series_value in series_data.items():
-                observations = series_value.get('observations', {})
-                if not observations:
-                    print(f"ECB PARSING WARNING: No 'observations' found in series {series_key} for {flow_ref}/{key_values}.")
-                    continue
-
-                for obs_key_index_str, obs_val_index_list in observations.items():
-                    actual_value_index = obs_val_index_list[0]
-                    value_obj = data_sets[0]['observations'].get(str(actual_value_index))
-                    if not value_obj:
-                        print(f"ECB PARSING WARNING: Missing value object for obs_key_index {obs_key_index_str} in dataSets[0].observations.")
-                        continue
-
-                    value = value_obj[0]
-                    
-                    time_period_ref_index = int(obs_key_index_str.split(":")[0])
-                    if time_period_ref_index >= len(data['structure']['dimensions']['observation'][0]['values']):
-                        print(f"ECB PARSING ERROR: Time period index {time_period_ref_index} out of bounds for structure.dimensions.observation values.")
-                        continue
-
-                    time_period_str = data['structure']['dimensions']['observation'][0]['values'][time_period_ref_index]['name']
-                    
-                    processed_data.append({
-                        "date": time_period_str,
-                        "value": float(value),
-                        "flow_ref": flow_ref,
-                        "key_values": key_values,
-                        "source": "ECB"
-                    })
-            processed_data.sort(key=lambda x: x['date'])
-            print(f"Successfully fetched and parsed {len(processed_data)} observations for ECB {flow_ref}/{key_values}.")
-            return processed_data
-        except (KeyError, IndexError, ValueError, TypeError) as parse_error:
-            print(f"CRITICAL ECB PARSING ERROR for {flow_ref}/{key_values}: {parse_error}")
-            # print(f"Problematic JSON structure snippet: {json.dumps(data, indent=2)[:1000]}...") # Uncomment for verbose
-            return []
+                try:
+                    response.encoding = "utf-8"
+                    reader = csv.DictReader(response.iter_lines(decode_unicode=True))
 
+                    # Store the series column-wise, oldest first. Each configured key is a single series
+                    # and ECB returns its rows in time order, so they are kept in arrival order unsorted.
+                    dates = []
+                    raw_values = []
+                    for row in reader:
+                        value = row['OBS_VALUE']
+                        if value:
+                            dates.append(row['TIME_PERIOD'])
+                            raw_values.append(value)
+                    values = list(map(float, raw_values))
+                except (KeyError, ValueError, TypeError, csv.Error) as parse_error:
+                    logger.critical("ECB PARSING ERROR for %s/%s: %s", flow_ref, key_values, parse_error)
+                    return None
+
+        logger.info("Successfully fetched and parsed %d observations for ECB %s/%s.", len(dates), flow_ref, key_values)
+        return {"flow_ref": flow_ref, "key_values": key_values, "source": "ECB", "dates": dates, "values": values}
     except requests.exceptions.RequestException as e:
-        print(f"ERROR fetching ECB data for {flow_ref}/{key_values} (Network/HTTP Error): {e}")
-        # print(f"ECB API response text on error: {response.text}") # Uncomment for very verbose error
-        return []
+        logger.error("Failed fetching ECB data for %s/%s (Network/HTTP Error): %s", flow_ref, key_values, e)
+        return None
 
 # --- Main Ingestion Logic (Cloud Run Entrypoint) ---
 
+def _store_series(name, data, count, filename, source):
+    """Uploads fetched series data to GCS and returns its ingestion result."""
+    if not count:
+        return {"status": "failed_fetch", "message": f"No data fetched from {source} for {name} or API error."}
+    if upload_to_gcs(data, filename):
+        return {"status": "success", "count": count, "gcs_path": filename}
+    return {"status": "failed_upload", "message": "GCS upload failed."}
+
+def _load_stored_series(filename):
+    """Returns (JSON bytes, parsed series) for a series already stored in GCS, or (None, None) if there is no usable copy."""
+    payload = download_from_gcs(filename)
+    if not payload:
+        return None, None
+    try:
+        data = orjson.loads(payload)
+    except orjson.JSONDecodeError as e:
+        logger.warning("Ignoring unreadable %s: %s", filename, e)
+        return None, None
+    # Blobs from before the columnar layout are plain record lists; those series are simply fetched in full again
+    if not isinstance(data, dict) or not data.get('dates'):
+        return None, None
+    return payload, data
+
+def _load_series_meta():
+    """Returns the FRED series meta recorded by the previous run, or {} if there is no usable copy."""
+    payload = download_from_gcs(FRED_SERIES_META_FILENAME)
+    if not payload:
+        return {}
+    try:
+        meta = orjson.loads(payload)
+    except orjson.JSONDecodeError as e:
+        logger.warning("Ignoring unreadable %s: %s", FRED_SERIES_META_FILENAME, e)
+        return {}
+    if not isinstance(meta, dict) or not all(isinstance(entry, dict) for entry in meta.values()):
+        logger.warning("Ignoring %s: expected a JSON object of per-series objects.", FRED_SERIES_META_FILENAME)
+        return {}
+    return meta
+
+def _process_fred(name, series_id, meta):
+    """
+    Fetches a single FRED series and uploads it to GCS.
+    meta holds the series' last_updated and Last-Modified from the previous run. If FRED's metadata still
+    reports the same last_updated, the observations are not fetched at all; otherwise only the newest
+    FRED_REVISION_WINDOW stored observations and anything after them are fetched and merged into the stored series.
+    Returns (ingestion result, serialized series, meta for the next run), so the bundle can reuse the JSON bytes.
+    A series that has not changed is not uploaded again; one skipped by the metadata check is not even
+    loaded from GCS, and has no serialized series.
+    """
+    logger.info("Attempting to fetch FRED series: %s (%s)", name, series_id)
+    filename = f"economic_data/fred/{name.lower()}.json"
+    last_updated = fred_last_updated(series_id)
+    if last_updated and last_updated == meta.get("last_updated"):
+        logger.info("FRED series %s not updated since %s. Skipping fetch.", series_id, last_updated)
+        return {"status": "unchanged", "gcs_path": filename}, None, meta
+
+    stored_payload, stored = _load_stored_series(filename)
+    if not stored:
+        # Nothing to merge into or to fall back on after a 304, so fetch the full history
+        meta = {}
+
+    # Stored series are newest first. The update reaches back FRED_REVISION_WINDOW observations,
+    # since FRED revises recent values (payrolls, GDP) after first publishing them
+    observation_start = stored['dates'][min(FRED_REVISION_WINDOW, len(stored['dates']) - 1)] if stored else None
+    data, last_modified = fetch_fred_data(series_id, meta.get("last_modified"), observation_start)
+    meta = {"last_updated": last_updated, "last_modified": last_modified}
+    if data is NOT_MODIFIED:
+        return {"status": "unchanged", "gcs_path": filename}, stored_payload, meta
+    if data and stored:
+        # Fresh observations replace the stored ones they overlap; only stored observations older
+        # than the oldest fresh one go behind them
+        cutoff = data['dates'][-1] if data['dates'] else observation_start
+        older = next((i for i, date in enumerate(stored['dates']) if date < cutoff), len(stored['dates']))
+        data['dates'] = (data['dates'] + stored['dates'][older:])[:FRED_OBSERVATION_LIMIT]
+        data['values'] = (data['values'] + stored['values'][older:])[:FRED_OBSERVATION_LIMIT]
+        if data == stored:
+            return {"status": "unchanged", "gcs_path": filename}, stored_payload, meta
+
+    count = len(data['dates']) if data else 0
+    payload = orjson.dumps(data) if count else None
+    result = _store_series(name, payload, count, filename, "FRED")
+    # Only keep the validators once the data they stand for is in GCS, otherwise the next run would skip it
+    return result, payload, meta if result["status"] == "success" else None
+
+def _process_ecb(name, config):
+    """Fetches a single ECB series and uploads it to GCS. Returns (ingestion result, serialized series)."""
+    logger.info("Attempting to fetch ECB series: %s (Flow: %s, Keys: %s)", name, config['flow_ref'], config['key_values'])
+    data = fetch_ecb_data(config["flow_ref"], config["key_values"])
+    count = len(data['dates']) if data else 0
+    payload = orjson.dumps(data) if count else None
+    return _store_series(name, payload, count, f"economic_data/ecb/{name.lower()}.json", "ECB"), payload
+
 @app.route('/ingest-economic-data', methods=['POST'])
 def ingest_economic_data():
     """
@@ -178,42 +391,72 @@ def ingest_economic_data():
     This endpoint is designed to be triggered by Cloud Scheduler via Pub/Sub,
     but this version is modified for direct manual POST testing.
     """
-    print(f"Ingestion process started at {datetime.now()} UTC")
+    logger.info("Ingestion process started")
 
     if request.method == 'POST':
-        print("Received manual POST request. Proceeding with ingestion...")
+        logger.info("Received manual POST request. Proceeding with ingestion...")
     else:
         return "Method Not Allowed", 405
 
-    ingestion_results = {}
+    # last_updated and Last-Modified per FRED series from the previous run, so unchanged series can be skipped
+    fred_series_meta = _load_series_meta()
 
-    # --- Fetch and Upload FRED Data ---
-    for name, series_id in FRED_SERIES.items():
-        print(f"Attempting to fetch FRED series: {name} ({series_id})")
-        data = fetch_fred_data(series_id)
-        if data:
-            filename = f"economic_data/fred/{name.lower()}.json"
-            if upload_to_gcs(data, filename):
-                ingestion_results[name] = {"status": "success", "count": len(data), "gcs_path": filename}
-            else:
-                ingestion_results[name] = {"status": "failed_upload", "message": "GCS upload failed."}
-        else:
-            ingestion_results[name] = {"status": "failed_fetch", "message": f"No data fetched from FRED for {name} or API error."}
-
-    # --- Fetch and Upload ECB Data ---
-    for name, config in ECB_SERIES.items():
-        print(f"Attempting to fetch ECB series: {name} (Flow: {config['flow_ref']}, Keys: {config['key_values']})")
-        data = fetch_ecb_data(config["flow_ref"], config["key_values"])
-        if data:
-            filename = f"economic_data/ecb/{name.lower()}.json"
-            if upload_to_gcs(data, filename):
-                ingestion_results[name] = {"status": "success", "count": len(data), "gcs_path": filename}
-            else:
-                ingestion_results[name] = {"status": "failed_upload", "message": "GCS upload failed."}
+    # --- Fetch and Upload FRED and ECB Data ---
+    # Each series is an external API round-trip plus a GCS upload, so run them concurrently.
+    # Submit the ECB series first: there are only a couple, and otherwise they would queue
+    # behind all of FRED's, leaving the ECB host idle while FRED waits on its concurrency cap
+    ecb_futures = {ingest_executor.submit(_process_ecb, name, config): name for name, config in ECB_SERIES.items()}
+    fred_futures = {
+        ingest_executor.submit(_process_fred, name, series_id, fred_series_meta.get(series_id, {})): name
+        for name, series_id in FRED_SERIES.items()
+    }
+
+    ingestion_results = {}
+    payloads = {}
+    new_series_meta = {}
+    for future in as_completed([*ecb_futures, *fred_futures]):
+        if future in fred_futures:
+            name = fred_futures[future]
+            ingestion_results[name], payloads[name], series_meta = future.result()
+            if series_meta and payloads[name]:
+                # Fingerprint the series as it now stands in GCS, so a bundle that fell behind it is rebuilt next run
+                digest = hashlib.blake2b(payloads[name], digest_size=8).hexdigest()
+                series_meta = {**series_meta, "digest": digest}
+            if series_meta:
+                new_series_meta[FRED_SERIES[name]] = series_meta
         else:
-            ingestion_results[name] = {"status": "failed_fetch", "message": f"No data fetched from ECB for {name} or API error."}
+            name = ecb_futures[future]
+            ingestion_results[name], payloads[name] = future.result()
+        logger.info("Finished %s: %s", name, ingestion_results[name]["status"])
+
+    # --- Upload the FRED bundle ---
+    # One object holding every fetched FRED series, so the API's "all indicators" path needs a single GCS read.
+    # It is stitched together from the per-series JSON bytes (stored copies for unchanged series) rather than
+    # serializing every series again. The series meta describes what the last uploaded bundle holds, so the
+    # bundle is only skipped if nothing differs from it.
+    if new_series_meta == fred_series_meta and all(ingestion_results[name]["status"] == "unchanged" for name in FRED_SERIES):
+        ingestion_results["FRED_BUNDLE"] = {"status": "unchanged", "gcs_path": FRED_BUNDLE_FILENAME}
+    else:
+        # Series skipped by the metadata check were not loaded, so take their JSON from the copies already in GCS
+        skipped = [name for name in FRED_SERIES if ingestion_results[name]["status"] == "unchanged" and not payloads[name]]
+        filenames = [ingestion_results[name]["gcs_path"] for name in skipped]
+        payloads.update(zip(skipped, ingest_executor.map(download_from_gcs, filenames)))
+        for name in skipped:
+            if not payloads[name]:
+                # No stored copy after all: forget its meta so the next run fetches it in full
+                new_series_meta.pop(FRED_SERIES[name], None)
+
+        # Keep the bundle in FRED_SERIES order regardless of completion order
+        fred_payloads = {name.lower(): payloads[name] for name in FRED_SERIES if payloads[name]}
+        fred_bundle = b"{" + b",".join(orjson.dumps(key) + b":" + payload for key, payload in fred_payloads.items()) + b"}"
+        ingestion_results["FRED_BUNDLE"] = _store_series("FRED_BUNDLE", fred_bundle, len(fred_payloads), FRED_BUNDLE_FILENAME, "FRED")
+
+    # Only record the new series meta once the bundle matches it; otherwise the previous meta stays,
+    # and the next run sees the difference and rebuilds the bundle
+    if ingestion_results["FRED_BUNDLE"]["status"] in ("success", "unchanged") and new_series_meta != fred_series_meta:
+        upload_to_gcs(new_series_meta, FRED_SERIES_META_FILENAME)
 
-    print(f"Ingestion process finished at {datetime.now()} UTC")
+    logger.info("Ingestion process finished")
     return jsonify({"ingestion_summary": ingestion_results}), 200
 
 # --- Health Check Endpoint (for Cloud Run) ---